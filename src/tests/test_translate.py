@@ -0,0 +1,97 @@
+#!/bin/env python
+
+import textwrap
+import unittest
+
+from clang.cindex import TypeKind
+
+from translate import model
+from translate.model import TypeInfo, translate_type
+
+
+class TestTranslateType(unittest.TestCase):
+
+    def test_translate_type(self):
+        expected = {
+            'uint32_t': 'c_uint32',
+            'char **': 'POINTER(POINTER(c_char))',
+            'vr::HmdMatrix34_t *': 'POINTER(HmdMatrix34_t)',
+            'bool[3]': 'openvr_bool * 3',
+            'float[3][4]': '(c_float * 4) * 3',
+            'uintptr_t': 'POINTER(c_uint)',
+            'const char *': 'c_char_p',
+            'X *': 'POINTER(X)',  # one letter pointee
+        }
+        for type_name, ctypes_name in expected.items():
+            self.assertEqual(translate_type(type_name), ctypes_name, type_name)
+
+
+class TestDeclarationStrings(unittest.TestCase):
+    """
+    Golden renderings of generated code, which must stay byte-identical
+    """
+
+    def test_struct(self):
+        struct = model.Struct(name='vr::HmdVector3_t', docstring='A 3D vector')
+        struct.add_field(model.StructField(name='v', type_='float [3]'))
+        self.assertEqual(str(struct), textwrap.dedent('''\
+            class HmdVector3_t(_VectorMixin, Structure):
+                """A 3D vector"""
+
+                _fields_ = [
+                    ("v", c_float * 3),
+                ]'''))
+
+    def test_ivr_class(self):
+        class_ = model.IVRClass(name='vr::IVRExample', docstring='Example interface')
+        get_value = model.Method(
+            name='GetValue',
+            type_=TypeInfo('float', TypeKind.FLOAT),
+            docstring='Returns a value',
+        )
+        get_value.add_parameter(model.Parameter(name='unIndex', type_=TypeInfo('uint32_t', TypeKind.TYPEDEF)))
+        class_.add_method(get_value)
+        set_name = model.Method(name='SetName', type_=TypeInfo('vr::EVRSettingsError', TypeKind.ENUM))
+        char_type = TypeInfo('const char', TypeKind.CHAR_S, const_qualified=True)
+        set_name.add_parameter(model.Parameter(
+            name='pchName',
+            type_=TypeInfo('const char *', TypeKind.POINTER, pointee=char_type),
+        ))
+        class_.add_method(set_name)
+        self.assertEqual(str(class_), textwrap.dedent('''\
+            class IVRExample_FnTable(Structure):
+                _fields_ = [
+                    ("getValue", OPENVR_FNTABLE_CALLTYPE(c_float, c_uint32)),
+                    ("setName", OPENVR_FNTABLE_CALLTYPE(EVRSettingsError, c_char_p)),
+                ]
+
+
+            class IVRExample(object):
+                """Example interface"""
+
+                def __init__(self):
+                    version_key = IVRExample_Version
+                    _checkInterfaceVersion(version_key)
+                    fn_key = 'FnTable:' + version_key
+                    fn_type = IVRExample_FnTable
+                    fn_table_ptr = cast(getGenericInterface(fn_key), POINTER(fn_type))
+                    if fn_table_ptr is None:
+                        raise OpenVRError("Error retrieving VR API for IVRExample")
+                    self.function_table = fn_table_ptr.contents
+
+                def getValue(self, index):
+                    """Returns a value"""
+                    fn = self.function_table.getValue
+                    result = fn(index)
+                    return result
+
+                def setName(self, name: str) -> None:
+                    fn = self.function_table.setName
+                    if name is not None:
+                        name = bytes(name, encoding='utf-8')
+                    error = fn(name)
+                    openvr.error_code.SettingsError.check_error_value(error)'''))
+
+
+if __name__ == '__main__':
+    unittest.main()
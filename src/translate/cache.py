@@ -0,0 +1,103 @@
+"""
+On-disk caches that let the generator skip work when its inputs are unchanged
+"""
+
+import hashlib
+import os
+import pickle
+import sys
+
+from clang.cindex import conf, _CXString
+
+import translate.model as model
+
+
+cache_dir = os.path.join(os.path.expanduser('~'), '.cache', 'pyopenvr')
+
+
+def generator_version():
+    """
+    Hash of the generator source files, so cached results expire whenever the generator changes
+    """
+    this_path = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+    for file_name in ('cache.py', 'generator.py', 'model.py', 'parser.py'):
+        with open(os.path.join(this_path, file_name), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def clang_version():
+    """
+    Version string of the libclang used to parse the headers, e.g. 'clang version 12.0.0'
+    """
+    get_version = conf.lib.clang_getClangVersion
+    get_version.restype = _CXString
+    get_version.errcheck = _CXString.from_result
+    return get_version()
+
+
+def output_key(header_string, sub_version):
+    """
+    Cache key for the generated files, from the header contents, the generator version,
+    and the libclang and python versions, since the parse depends on those too
+    """
+    digest = hashlib.sha256(generator_version().encode('utf-8'))
+    digest.update(header_string)
+    digest.update(str(sub_version).encode('utf-8'))
+    digest.update(clang_version().encode('utf-8'))
+    digest.update(sys.version.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def load_outputs(key):
+    """
+    Returns a dict of generated file contents keyed on file name, or None on a cache miss
+    """
+    return _load(f'outputs-{key}.pickle')
+
+
+def save_outputs(key, outputs):
+    """
+    Store the generated files, replacing any cached from older inputs
+    """
+    _save(f'outputs-{key}.pickle', outputs)
+    _remove_stale(prefix='outputs-', keep=f'outputs-{key}.pickle')
+
+
+def load_translated_types():
+    """
+    Warm up the translate_type() memo table from a previous run of the same generator version
+    """
+    table = _load(f'translated_types-{generator_version()}.pickle')
+    if table is not None:
+        model._translated_types.update(table)
+
+
+def save_translated_types():
+    file_name = f'translated_types-{generator_version()}.pickle'
+    _save(file_name, model._translated_types)
+    _remove_stale(prefix='translated_types-', keep=file_name)
+
+
+def _load(file_name):
+    try:
+        with open(os.path.join(cache_dir, file_name), 'rb') as f:
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None
+
+
+def _save(file_name, value):
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(os.path.join(cache_dir, file_name), 'wb') as f:
+        pickle.dump(value, f)
+
+
+def _remove_stale(prefix, keep):
+    for file_name in os.listdir(cache_dir):
+        if file_name.startswith(prefix) and file_name != keep:
+            try:
+                os.remove(os.path.join(cache_dir, file_name))
+            except OSError:
+                pass
@@ -1,8 +1,12 @@
+import argparse
+import concurrent.futures
 import inspect
+import io
 import pkg_resources
 import textwrap
 
 from translate.parser import Parser
+import translate.cache as cache
 import translate.model as model
 
 
@@ -165,14 +169,15 @@ class CTypesGenerator(object):
             print(index, file=file_out)
 
     @staticmethod
-    def generate(declarations, file_out, version):
+    def generate(declarations, file_out, version, jobs=1):
+        texts = render_declarations(declarations, jobs=jobs)
         CTypesGenerator.write_preamble(file_out=file_out, version=version)
-        for declaration in declarations:
+        for declaration, text in zip(declarations, texts):
             if isinstance(declaration, model.StructureForwardDeclaration):
                 print('\n', file=file_out)
                 if declaration.docstring is not None:
                     print(f'# {declaration.docstring}', file=file_out)
-                print(declaration, file=file_out)
+                print(text, file=file_out)
         print('\n', file=file_out)
         print(inspect.cleandoc('''
             ####################
@@ -180,9 +185,9 @@ class CTypesGenerator(object):
             ####################
         '''), file=file_out)
         print('', file=file_out)
-        for declaration in declarations:
+        for declaration, text in zip(declarations, texts):
             if isinstance(declaration, model.ConstantDeclaration):
-                print(declaration, file=file_out)
+                print(text, file=file_out)
 
         print('', file=file_out)
         print(inspect.cleandoc('''
@@ -194,9 +199,9 @@ class CTypesGenerator(object):
             ENUM_VALUE_TYPE = int
         '''), file=file_out)
         print('', file=file_out)
-        for declaration in declarations:
+        for declaration, text in zip(declarations, texts):
             if isinstance(declaration, model.EnumDecl):
-                print(declaration, file=file_out)
+                print(text, file=file_out)
                 print('', file=file_out)
 
         print('', file=file_out)
@@ -209,10 +214,10 @@ class CTypesGenerator(object):
             openvr_bool = c_ubyte
         '''), file=file_out)
         print('', file=file_out)
-        for declaration in declarations:
+        for declaration, text in zip(declarations, texts):
             if isinstance(declaration, model.Typedef):
-                if len(str(declaration)) > 0:
-                    print(declaration, file=file_out)
+                if len(text) > 0:
+                    print(text, file=file_out)
 
         print('', file=file_out)
         print(inspect.cleandoc('''
@@ -256,19 +261,19 @@ class CTypesGenerator(object):
                     return str(list(list(e) for e in self))
         '''), file=file_out)
         print('\n', file=file_out)
-        for declaration in declarations:
+        for declaration, text in zip(declarations, texts):
             if isinstance(declaration, model.Struct):
-                print(declaration, file=file_out)
+                print(text, file=file_out)
                 print('\n', file=file_out)
 
-        for declaration in declarations:
+        for declaration, text in zip(declarations, texts):
             if isinstance(declaration, model.COpenVRContext):
-                print(declaration, file=file_out)
+                print(text, file=file_out)
                 print('', file=file_out)
 
-        for declaration in declarations:
+        for declaration, text in zip(declarations, texts):
             if isinstance(declaration, model.IVRClass):
-                print(declaration, file=file_out)
+                print(text, file=file_out)
                 print('\n', file=file_out)
 
         print(inspect.cleandoc('''
@@ -313,14 +318,45 @@ class CTypesGenerator(object):
                 """
                 shutdownInternal()  # OK, this is just like inline definition in openvr.h
         '''), file=file_out)
-        for declaration in declarations:
+        for declaration, text in zip(declarations, texts):
             if isinstance(declaration, model.Function):
                 print('\n', file=file_out)
-                print(declaration, file=file_out)
+                print(text, file=file_out)
 
         print('Generate complete')
 
 
+def render_declarations(declarations, jobs=1):
+    """
+    Returns str(declaration) for each declaration, in order.
+    With jobs > 1 the declarations are rendered in a pool of worker processes. Each worker starts
+    from a copy of this process's translate_type() table, and the entries the workers add are merged
+    back here, so the table saved by cache.save_translated_types() is as complete as a serial run.
+    """
+    if jobs <= 1:
+        return [str(declaration) for declaration in declarations]
+    chunk_size = max(1, len(declarations) // (4 * jobs))
+    chunks = [declarations[i:i + chunk_size] for i in range(0, len(declarations), chunk_size)]
+    texts = []
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_render_worker,
+            initargs=(dict(model._translated_types), ),
+    ) as executor:
+        for chunk_texts, translated_types in executor.map(_render_chunk, chunks):
+            texts.extend(chunk_texts)
+            model._translated_types.update(translated_types)
+    return texts
+
+
+def _init_render_worker(translated_types):
+    model._translated_types.update(translated_types)
+
+
+def _render_chunk(declarations):
+    return [str(declaration) for declaration in declarations], model._translated_types
+
+
 def get_version(declarations):
     version = [0, 0, 0]
     for declaration in declarations:
@@ -339,27 +375,63 @@ def get_version(declarations):
     return tuple(version)
 
 
-def main(sub_version=1):
+def main(sub_version=1, use_cache=True, jobs=1):
     file_name1 = 'openvr.h'
     file_string1 = pkg_resources.resource_string(__name__, file_name1)
-    declarations = Parser().parse_file(file_name=file_name1, file_string=file_string1)
+    cache_key = cache.output_key(file_string1, sub_version)
+    outputs = None
+    if use_cache:
+        outputs = cache.load_outputs(cache_key)
+    if outputs is None:
+        if use_cache:
+            cache.load_translated_types()
+        outputs = generate_outputs(
+            file_name=file_name1,
+            file_string=file_string1,
+            sub_version=sub_version,
+            jobs=jobs,
+        )
+        if use_cache:
+            cache.save_outputs(cache_key, outputs)
+            cache.save_translated_types()
+    else:
+        print('Inputs unchanged; using cached generated files')
+    for file_name, text in outputs.items():
+        with open(file_name, 'w', newline=None) as file_out:
+            file_out.write(text)
+
+
+def generate_outputs(file_name, file_string, sub_version, jobs=1):
+    """
+    Returns the contents of each generated file, keyed on output file name
+    """
+    declarations = Parser().parse_file(file_name=file_name, file_string=file_string)
     version = get_version(declarations)
     patch_version = str(version[2]).zfill(2) + str(sub_version).zfill(2)
     py_version = (version[0], version[1], patch_version)
+    version_out = io.StringIO()
     write_version(
-        file_out=open('../openvr/version.py', 'w'),
+        file_out=version_out,
         version=py_version,
     )
+    init_out = io.StringIO()
+    errors_out = io.StringIO()
     generator = CTypesGenerator()
     generator.generate(
         declarations=declarations,
-        file_out=open('../openvr/__init__.py', 'w', newline=None),
+        file_out=init_out,
         version=version,
+        jobs=jobs,
     )
     generator.generate_errors(
         declarations=declarations,
-        file_out=open('../openvr/error_code/__init__.py', 'w', newline=None),
+        file_out=errors_out,
     )
+    return {
+        '../openvr/version.py': version_out.getvalue(),
+        '../openvr/__init__.py': init_out.getvalue(),
+        '../openvr/error_code/__init__.py': errors_out.getvalue(),
+    }
 
 
 def write_version(version, file_out):
@@ -375,5 +447,11 @@ def write_version(version, file_out):
 
 
 if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description='Generate the openvr python bindings from openvr.h')
+    arg_parser.add_argument(
+        '--no-cache', action='store_true',
+        help=f'always regenerate, without reading or writing the cache in {cache.cache_dir}',
+    )
+    args = arg_parser.parse_args()
     # Increase sub_version for additional python-only releases within a single openvr version
-    main(sub_version=2)
+    main(sub_version=2, use_cache=not args.no_cache)
@@ -1,7 +1,118 @@
 from clang.cindex import TypeKind
-import inspect
+from functools import cached_property
 import re
-import textwrap
+from string import Template
+
+
+# Precompiled patterns used by translate_type()
+_RE_CONST_PREFIX = re.compile(r'\bconst\s+')
+_RE_CONST_SUFFIX = re.compile(r'\s+const\b')
+_RE_STRUCT = re.compile(r'\bstruct\s+')
+_RE_ENUM = re.compile(r'\benum\s+')
+_RE_UNION = re.compile(r'\bunion\s+')
+_RE_INT_SUFFIX = re.compile(r'(8|16|32|64)_t\b')
+_RE_UNSIGNED = re.compile(r'\bunsigned\s+')
+_RE_CHAR_PTR = re.compile(r'^\s*(?:const\s+)?char\s*\*\s*$')
+_RE_LONGLONG = re.compile(r'\blong\s+long\b')
+_RE_CTYPES_PREFIX = re.compile(r'^(float|u?int|double|u?char|u?short|u?long)')
+_RE_PTR_T = re.compile(r'^([^*]+)ptr(?:_t)?(.*)$')
+_RE_ARRAY = re.compile(r'^([^\[]+\S)\s*\[(\d+)\](.*)$')
+
+# Precompiled patterns used by FunctionBase and Parameter
+_RE_ARRAY_COUNT = re.compile(r'array_count:(\S+);')
+_RE_ERROR_TYPE = re.compile(r'^(vr::)?E\S+Error$')
+_RE_HUNGARIAN_PREFIX = re.compile(r'^[a-z]{1,5}([A-Z].*)$')
+_RE_TRACKED_DEVICE_COUNT = re.compile(r'^trackedDevice.*Count$')
+_RE_POSE_ARRAY_COUNT = re.compile(r'^\S+PoseArrayCount$')
+
+_FLOAT_TYPE_KINDS = frozenset((
+    TypeKind.FLOAT,
+    TypeKind.DOUBLE,
+    TypeKind.LONGDOUBLE,
+    TypeKind.FLOAT128,
+))
+
+_INT_TYPE_KINDS = frozenset((
+    TypeKind.USHORT,
+    TypeKind.UINT,
+    TypeKind.ULONG,
+    TypeKind.ULONGLONG,
+    TypeKind.UINT128,
+    TypeKind.SHORT,
+    TypeKind.INT,
+    TypeKind.LONG,
+    TypeKind.LONGLONG,
+    TypeKind.INT128,
+))
+
+# Templates for generated declarations, already at their final indentation
+_FUNCTION_HEADER_TEMPLATE = '''\
+_openvr.{name}.restype = {restype}
+_openvr.{name}.argtypes = [{arg_types}]
+
+
+'''
+
+_COPENVR_CONTEXT_TEMPLATE = Template('''\
+class ${name}(object):${docstring}
+    def __init__(self):
+${members}
+    def checkClear(self):
+        global _vr_token
+        if _vr_token != getInitToken():
+            self.clear()
+            _vr_token = getInitToken()
+
+    def clear(self):
+${members}
+${methods}
+# Globals for context management
+_vr_token = None
+_internal_module_context = COpenVRContext()
+${functions}''')
+
+_COPENVR_CONTEXT_METHOD_TEMPLATE = Template('''\
+    def ${name}(self):
+        self.checkClear()
+        if self.m_p${name} is None:
+            self.m_p${name} = I${name}()
+        return self.m_p${name}
+
+''')
+
+_COPENVR_CONTEXT_FUNCTION_TEMPLATE = Template('''\
+
+
+def ${name}():
+    return _internal_module_context.${name}()
+''')
+
+_IVR_CLASS_TEMPLATE = Template('''\
+class ${name}_FnTable(Structure):
+    _fields_ = [${fn_table_methods}
+    ]
+
+
+class ${name}(${base}):${docstring}
+    def __init__(self):
+        version_key = ${name}_Version
+        _checkInterfaceVersion(version_key)
+        fn_key = 'FnTable:' + version_key
+        fn_type = ${name}_FnTable
+        fn_table_ptr = cast(getGenericInterface(fn_key), POINTER(fn_type))
+        if fn_table_ptr is None:
+            raise OpenVRError("Error retrieving VR API for ${name}")
+        self.function_table = fn_table_ptr.contents
+${methods}''')
+
+_STRUCT_TEMPLATE = Template('''\
+class ${name}(${base}):${docstring}
+    _fields_ = [${fields}
+    ]''')
+
+_STRUCTURE_FORWARD_DECLARATION_TEMPLATE = Template('''\
+class ${name}(Structure):
+    pass''')
 
 
 class Declaration(object):
@@ -13,26 +124,81 @@ class Declaration(object):
         return f'{self.name}'
 
 
+class TypeInfo(object):
+    """
+    Picklable snapshot of the parts of a clang Type used by the model
+    """
+    def __init__(self, spelling, kind, const_qualified=False, pointee=None):
+        self.spelling = spelling
+        self.kind = kind
+        self.const_qualified = const_qualified
+        self.pointee = pointee
+
+    def __getstate__(self):
+        # TypeKind instances are compared by identity, so pickle the kind by id
+        state = self.__dict__.copy()
+        state['kind'] = self.kind.value
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.kind = TypeKind.from_id(state['kind'])
+
+    @staticmethod
+    def from_clang(type_):
+        if isinstance(type_, TypeInfo):
+            return type_
+        pointee = None
+        if type_.kind != TypeKind.INVALID:
+            pointee = TypeInfo.from_clang(type_.get_pointee())
+        return TypeInfo(
+            spelling=type_.spelling,
+            kind=type_.kind,
+            const_qualified=type_.is_const_qualified(),
+            pointee=pointee,
+        )
+
+    def get_pointee(self):
+        return self.pointee
+
+    def is_const_qualified(self):
+        return self.const_qualified
+
+
 class FunctionBase(Declaration):
     def __init__(self, name, type_=None, docstring=None):
         super().__init__(name=name, docstring=docstring)
-        self.type = type_
+        self.type = None
+        if type_ is not None:
+            self.type = TypeInfo.from_clang(type_)
         self.parameters = []
-        self._count_parameter_names = set()
+        self._finalized = False
+        # pythonically downcase first letter of method name
+        n = name
+        if n.startswith('VR_'):
+            n = n[3:]
+        self.py_name = n[:1].lower() + n[1:]
 
     def __str__(self):
         return self.ctypes_string()
 
     def add_parameter(self, parameter):
-        # Tag count parameters
-        m = parameter.is_array()
-        if m:
-            self._count_parameter_names.add(m.group(1))
-        if parameter.name in self._count_parameter_names:
-            parameter.is_count = True
-        if parameter.name in ('punRequiredBufferSize', ):
-            parameter.is_required_count = True  # getRuntimePath()
         self.parameters.append(parameter)
+        self._finalized = False
+
+    def finalize(self):
+        """
+        Tag count parameters, once all parameters have been added
+        """
+        if self._finalized:
+            return
+        count_names = {n for n in (p.is_array() for p in self.parameters) if n}
+        for p in self.parameters:
+            if p.name in count_names:
+                p.is_count = True
+            if p.name in ('punRequiredBufferSize', ):
+                p.is_required_count = True  # getRuntimePath()
+        self._finalized = True
 
     def annotate_parameters(self):
         for pix, p in enumerate(self.parameters):
@@ -46,113 +212,118 @@ class FunctionBase(Declaration):
                     t = translate_type(t)
                     p.always_value = f'sizeof({t})'
 
-    def ctypes_string(self, in_params=()):
+    def ctypes_string(self, in_params=(), indent=0):
         in_params = list(in_params)
+        self.finalize()
         self.annotate_parameters()
+        raise_error_code = self.raise_error_code()
+        has_return = self.has_return()
         call_params = []
         out_params = []
-        if self.has_return() and not self.raise_error_code():
+        if has_return and not raise_error_code:
             param = 'result'
             if self.returns_const_string():
                 param = f"{param}.decode('utf-8')"
             out_params.append(param)
-        pre_call_statements = ''
-        post_call_statements = ''
-        for p in self.parameters:
-            if p.input_param_name():
-                in_params.append(p.input_param_name())
-            if p.call_param_name():
-                call_params.append(p.call_param_name())
-            if p.return_param_name():
-                out_params.append(p.return_param_name())
-            pre_call_statements += p.pre_call_block()
-            post_call_statements += p.post_call_block()
-        # Handle output strings
+        pre_call_statements = []
+        post_call_statements = []
+        # Single pass over the parameters, so each one's names and blocks are computed only once
+        call_param_names = []
+        output_string_indices = []
         for pix, p in enumerate(self.parameters):
+            input_param_name = p.input_param_name()
+            if input_param_name:
+                in_params.append(input_param_name)
+            call_param_name = p.call_param_name()
+            call_param_names.append(call_param_name)
+            if call_param_name:
+                call_params.append(call_param_name)
+            return_param_name = p.return_param_name()
+            if return_param_name:
+                out_params.append(return_param_name)
+            pre_call_statements.append(p.pre_call_block())
+            post_call_statements.append(p.post_call_block())
             if p.is_output_string():
-                len_param = self.parameters[pix + 1]
-                if len_param.is_struct_size():
-                    len_param = self.parameters[pix + 2]
-                len_param.is_count = True
-                call_params0 = []
-                # Treat VR_GetRuntimePath specially...
-                initial_buffer_size = 0
-                length_is_retval = True
-                required_len_param = None
-                if len(self.parameters) >= 3 and self.parameters[2].name == 'punRequiredBufferSize':
-                    initial_buffer_size = 1
-                    length_is_retval = False
-                    required_len_param = self.parameters[2]
-                if initial_buffer_size > 0:
-                    pre_call_statements += f'{p.py_name} = ctypes.create_string_buffer({initial_buffer_size})\n'
-                for p2 in self.parameters:
-                    if p2 is p:
-                        if initial_buffer_size == 0:
-                            call_params0.append('None')
-                        else:
-                            call_params0.append(p2.call_param_name())
-                    elif p2 is len_param:
-                        call_params0.append(str(initial_buffer_size))
-                    elif p2.call_param_name():
-                        call_params0.append(p2.call_param_name())
-                param_list = ', '.join(call_params0)
-                if length_is_retval:
-                    pre_call_statements += textwrap.dedent(f'''\
-                        {len_param.py_name} = fn({param_list})
-                    ''')
-                    error_category = None
-                    error_param_name = 'error'
-                    if not self.raise_error_code():
-                        for p2 in self.parameters:
-                            if p2.is_error():
-                                assert p2.type.kind == TypeKind.POINTER
-                                pt = p2.type.get_pointee()
-                                error_category = translate_error_category(pt)
-                                break
-                    if error_category is not None:
-                        pre_call_statements += textwrap.dedent(f'''\
-                            try:
-                                {error_category}.check_error_value(error.value)
-                            except openvr.error_code.BufferTooSmallError:
-                                pass
-                        ''')
-                    pre_call_statements += textwrap.dedent(f'''\
-                        {p.py_name} = ctypes.create_string_buffer({len_param.py_name})
-                    ''')
-                else:  # getRuntimePath()
-                    pre_call_statements += textwrap.dedent(f'''\
-                        fn({param_list})
-                        {len_param.py_name} = {required_len_param.py_name}.value
-                        {p.py_name} = ctypes.create_string_buffer({len_param.py_name})
-                    ''')
+                output_string_indices.append(pix)
+        # Handle output strings
+        for pix in output_string_indices:
+            p = self.parameters[pix]
+            len_param = self.parameters[pix + 1]
+            if len_param.is_struct_size():
+                len_param = self.parameters[pix + 2]
+            len_param.is_count = True
+            call_params0 = []
+            # Treat VR_GetRuntimePath specially...
+            initial_buffer_size = 0
+            length_is_retval = True
+            required_len_param = None
+            if len(self.parameters) >= 3 and self.parameters[2].name == 'punRequiredBufferSize':
+                initial_buffer_size = 1
+                length_is_retval = False
+                required_len_param = self.parameters[2]
+            if initial_buffer_size > 0:
+                pre_call_statements.append(f'{p.py_name} = ctypes.create_string_buffer({initial_buffer_size})\n')
+            for p2, call_param_name in zip(self.parameters, call_param_names):
+                if p2 is p:
+                    if initial_buffer_size == 0:
+                        call_params0.append('None')
+                    else:
+                        call_params0.append(call_param_name)
+                elif p2 is len_param:
+                    call_params0.append(str(initial_buffer_size))
+                elif call_param_name:
+                    call_params0.append(call_param_name)
+            param_list = ', '.join(call_params0)
+            if length_is_retval:
+                pre_call_statements.append(f'{len_param.py_name} = fn({param_list})\n')
+                error_category = None
+                if not raise_error_code:
+                    for p2 in self.parameters:
+                        if p2.is_error():
+                            assert p2.type.kind == TypeKind.POINTER
+                            pt = p2.type.get_pointee()
+                            error_category = translate_error_category(pt)
+                            break
+                if error_category is not None:
+                    pre_call_statements.append(
+                        'try:\n'
+                        f'    {error_category}.check_error_value(error.value)\n'
+                        'except openvr.error_code.BufferTooSmallError:\n'
+                        '    pass\n'
+                    )
+                pre_call_statements.append(f'{p.py_name} = ctypes.create_string_buffer({len_param.py_name})\n')
+            else:  # getRuntimePath()
+                pre_call_statements.append(
+                    f'fn({param_list})\n'
+                    f'{len_param.py_name} = {required_len_param.py_name}.value\n'
+                    f'{p.py_name} = ctypes.create_string_buffer({len_param.py_name})\n'
+                )
         param_list1 = ', '.join(in_params)
-        # pythonically downcase first letter of method name
         result_annotation = ''
         if len(out_params) == 0:
             result_annotation = ' -> None'
-        method_string = f'def {self.py_method_name()}({param_list1}){result_annotation}:\n'
-        body_string = ''
+        method_string = f'{" "*indent}def {self.py_name}({param_list1}){result_annotation}:\n'
+        body_strings = []
         if self.docstring:
-            body_string += f'"""{self.docstring}"""\n'
-        body_string += f'fn = {self.inner_function_name()}\n'
-        body_string += pre_call_statements
+            body_strings.append(f'"""{self.docstring}"""\n')
+        body_strings.append(f'fn = {self.inner_function_name()}\n')
+        body_strings.extend(pre_call_statements)
         param_list2 = ', '.join(call_params)
-        if self.raise_error_code():
-            body_string += f'error = fn({param_list2})'
-        elif self.has_return():
-            body_string += f'result = fn({param_list2})'
-        else:
-            body_string += f'fn({param_list2})'
-        if self.raise_error_code():
+        if raise_error_code:
+            body_strings.append(f'error = fn({param_list2})')
             error_category = translate_error_category(self.type)
-            post_call_statements += f'\n{error_category}.check_error_value(error)'
-        body_string += post_call_statements
-        if self.py_method_name() == 'pollNextEvent':
-            body_string += '\nreturn result != 0'  # Custom return statement
+            post_call_statements.append(f'\n{error_category}.check_error_value(error)')
+        elif has_return:
+            body_strings.append(f'result = fn({param_list2})')
+        else:
+            body_strings.append(f'fn({param_list2})')
+        body_strings.extend(post_call_statements)
+        if self.py_name == 'pollNextEvent':
+            body_strings.append('\nreturn result != 0')  # Custom return statement
         elif len(out_params) > 0:
             results = ', '.join(out_params)
-            body_string += f'\nreturn {results}'
-        body_string = textwrap.indent(body_string, ' '*4)
+            body_strings.append(f'\nreturn {results}')
+        body_string = _indent(''.join(body_strings), indent + 4)
         method_string += body_string
         return method_string
 
@@ -165,16 +336,10 @@ class FunctionBase(Declaration):
         return True
 
     def inner_function_name(self):
-        return f'self.function_table.{self.py_method_name()}'
-
-    def py_method_name(self):
-        n = self.name
-        if n.startswith('VR_'):
-            n = n[3:]
-        return n[0].lower() + n[1:]
+        return f'self.function_table.{self.py_name}'
 
     def raise_error_code(self):
-        return re.match(r'(?:vr::)?E\S+Error$', self.type.spelling)
+        return _RE_ERROR_TYPE.match(self.type.spelling)
 
     def returns_const_string(self):
         if not self.type.kind == TypeKind.POINTER:
@@ -194,52 +359,17 @@ class COpenVRContext(Declaration):
     def __str__(self):
         docstring = ''
         if self.docstring:
-            docstring = textwrap.indent(f'\n"""{self.docstring}"""\n', ' '*16)
-        name = translate_type(self.name)
-        class_string = textwrap.dedent(f'''\
-            class {name}(object):{docstring}
-                def __init__(self):
-        ''')
-        for m in self.vr_member_names:
-            class_string += ' '*8 + f'self.{m} = None\n'
-        class_string += textwrap.indent(textwrap.dedent(f'''\
-                
-                def checkClear(self):
-                    global _vr_token
-                    if _vr_token != getInitToken():
-                        self.clear()
-                        _vr_token = getInitToken()
-                        
-                def clear(self):  
-        '''), ' '*4)
-        for m in self.vr_member_names:
-            class_string += ' '*8 + f'self.{m} = None\n'
-        class_string += '\n'
-        for m in self.vr_method_names:
-            method_string = textwrap.dedent(f'''\
-                def {m}(self):
-                    self.checkClear()
-                    if self.m_p{m} is None:
-                        self.m_p{m} = I{m}()
-                    return self.m_p{m}
-                              
-            ''')
-            class_string += textwrap.indent(method_string, ' '*4)
-        class_string += textwrap.dedent(f'''\
-            
-            # Globals for context management
-            _vr_token = None
-            _internal_module_context = COpenVRContext()
-        ''')
-        for m in self.vr_method_names:
-            method_string = textwrap.dedent(f'''\
-                
-                
-                def {m}():
-                    return _internal_module_context.{m}()
-            ''')
-            class_string += method_string
-        return class_string
+            docstring = _indent(f'\n"""{self.docstring}"""\n', 4)
+        members = ''.join(f'{" "*8}self.{m} = None\n' for m in self.vr_member_names)
+        methods = ''.join(_COPENVR_CONTEXT_METHOD_TEMPLATE.substitute(name=m) for m in self.vr_method_names)
+        functions = ''.join(_COPENVR_CONTEXT_FUNCTION_TEMPLATE.substitute(name=m) for m in self.vr_method_names)
+        return _COPENVR_CONTEXT_TEMPLATE.substitute(
+            name=translate_type(self.name),
+            docstring=docstring,
+            members=members,
+            methods=methods,
+            functions=functions,
+        )
 
     def add_vr_member_name(self, name):
         self.vr_member_names.append(name)
@@ -257,36 +387,33 @@ class IVRClass(Declaration):
     def __str__(self):
         docstring = ''
         if self.docstring:
-            docstring = textwrap.indent(f'\n"""{self.docstring}"""\n', ' '*16)
-        name = translate_type(self.name)
-        methods = 'pass'
+            docstring = _indent(f'\n"""{self.docstring}"""\n', 4)
+        name = self.translated_name
+        methods = '    pass'
         fn_table_methods = ''
         if len(self.methods) > 0:
-            methods = '\n'
+            method_strings = []
+            fn_table_strings = []
             for method in self.methods:
-                methods += textwrap.indent(str(method), 16*' ') + '\n\n'
-                fn_table_methods += '\n' + ' '*20 + f'{method.ctypes_fntable_string()}'
-        return inspect.cleandoc(f'''
-            class {name}_FnTable(Structure):
-                _fields_ = [{fn_table_methods}
-                ]
-        
-
-            class {name}({self.base}):{docstring}
-                def __init__(self):
-                    version_key = {name}_Version
-                    _checkInterfaceVersion(version_key)
-                    fn_key = 'FnTable:' + version_key
-                    fn_type = {name}_FnTable
-                    fn_table_ptr = cast(getGenericInterface(fn_key), POINTER(fn_type))
-                    if fn_table_ptr is None:
-                        raise OpenVRError("Error retrieving VR API for {name}")
-                    self.function_table = fn_table_ptr.contents\n{methods}
-        ''')
+                method_strings.append(method.ctypes_string(indent=4))
+                fn_table_strings.append('\n' + ' '*8 + f'{method.ctypes_fntable_string()}')
+            methods = '\n' + '\n\n'.join(method_strings)
+            fn_table_methods = ''.join(fn_table_strings)
+        return _IVR_CLASS_TEMPLATE.substitute(
+            name=name,
+            base=self.base,
+            docstring=docstring,
+            fn_table_methods=fn_table_methods,
+            methods=methods,
+        )
 
     def add_method(self, method):
         self.methods.append(method)
 
+    @cached_property
+    def translated_name(self):
+        return translate_type(self.name)
+
 
 class ConstantDeclaration(Declaration):
     def __init__(self, name, value, docstring=None):
@@ -309,10 +436,8 @@ class EnumDecl(Declaration):
         self.constants.append(constant)
 
     def __str__(self):
-        result = f'{self.name} = ENUM_TYPE'
-        for c in self.constants:
-            result += f'\n{c}'
-        return result
+        constants = [str(c) for c in self.constants]
+        return '\n'.join([f'{self.name} = ENUM_TYPE', *constants])
 
 
 class EnumConstant(Declaration):
@@ -334,45 +459,52 @@ class Function(FunctionBase):
         for p in self.parameters:
             param_types.append(translate_type(p.type.spelling))
         arg_types = ', '.join(param_types)
-        result = textwrap.dedent(f'''\
-                _openvr.{self.name}.restype = {restype}
-                _openvr.{self.name}.argtypes = [{arg_types}]
-
-
-        ''')
+        result = _FUNCTION_HEADER_TEMPLATE.format(name=self.name, restype=restype, arg_types=arg_types)
         result += super().ctypes_string()
         return result
 
 
 class Method(FunctionBase):
     def ctypes_fntable_string(self):
-        method_name = self.name[0].lower() + self.name[1:]
         param_list = [translate_type(self.type.spelling), ]
         for p in self.parameters:
             param_list.append(translate_type(p.type.spelling))
         params = ', '.join(param_list)
-        result = f'("{method_name}", OPENVR_FNTABLE_CALLTYPE({params})),'
+        result = f'("{self.py_name}", OPENVR_FNTABLE_CALLTYPE({params})),'
         return result
 
-    def ctypes_string(self):
-        return super().ctypes_string(in_params=['self', ])
+    def ctypes_string(self, indent=0):
+        return super().ctypes_string(in_params=['self', ], indent=indent)
 
 
 class Parameter(Declaration):
     def __init__(self, name, type_, default_value=None, docstring=None, annotation=None):
         super().__init__(name=name, docstring=docstring)
-        self.type = type_
+        self.type = TypeInfo.from_clang(type_)
         self.always_value = None
         self.default_value = default_value
         self.annotation = annotation
         self.is_count = False
         self.is_required_count = False
         self.py_name = self.get_py_name(self.name)
+        # These tags depend only on the name, type and annotation, so compute them once
+        self._is_pointer = self.type.kind == TypeKind.POINTER
+        self._pointee = self.type.get_pointee() if self._is_pointer else None
+        self._array_count_name = None
+        if annotation:
+            m = _RE_ARRAY_COUNT.match(annotation)
+            if m:
+                self._array_count_name = m.group(1)
+        self._is_output_string = bool(annotation) and str(annotation) == 'out_string: ;'
+        self._is_error = self._compute_is_error()
+        self._is_input_string = self._compute_is_input_string()
+        self._is_output_pointer = self._compute_is_output_pointer()
+        self._is_struct_size = self._compute_is_struct_size()
 
     @staticmethod
     def get_py_name(c_name):
         result = c_name
-        match = re.match(r'^[a-z]{1,5}([A-Z].*)$', result)
+        match = _RE_HUNGARIAN_PREFIX.match(result)
         if match:  # strip initial hungarian prefix
             n = match.group(1)
             result = n[0].lower() + n[1:]  # convert first character to lower case
@@ -381,61 +513,53 @@ class Parameter(Declaration):
         return result
 
     def is_array(self):
-        if not self.annotation:
-            return False
-        return re.match(r'array_count:(\S+);', self.annotation)
+        """
+        Returns the name of the array count parameter, or None if this parameter is not an array
+        """
+        return self._array_count_name
 
     def is_error(self):
-        if self.type.kind != TypeKind.POINTER:
+        return self._is_error
+
+    def _compute_is_error(self):
+        if not self._is_pointer:
             return False
-        t = translate_type(self.type.get_pointee().spelling)
-        if re.match(r'^(vr::)?E\S+Error$', t):
+        t = translate_type(self._pointee.spelling)
+        if _RE_ERROR_TYPE.match(t):
             return True
         return False
 
     def is_input_string(self):
-        if not self.type.kind == TypeKind.POINTER:
+        return self._is_input_string
+
+    def _compute_is_input_string(self):
+        if not self._is_pointer:
             return False
-        pt = self.type.get_pointee()
+        pt = self._pointee
         if not pt.is_const_qualified():
             return False
         return pt.kind == TypeKind.CHAR_S
 
     def is_float(self):
-        return self.type.kind in (
-            TypeKind.FLOAT,
-            TypeKind.DOUBLE,
-            TypeKind.LONGDOUBLE,
-            TypeKind.FLOAT128,
-        )
+        return self.type.kind in _FLOAT_TYPE_KINDS
 
     def is_int(self):
-        return self.type.kind in (
-            TypeKind.USHORT,
-            TypeKind.UINT,
-            TypeKind.ULONG,
-            TypeKind.ULONGLONG,
-            TypeKind.UINT128,
-            TypeKind.SHORT,
-            TypeKind.INT,
-            TypeKind.LONG,
-            TypeKind.LONGLONG,
-            TypeKind.INT128,
-        )
+        return self.type.kind in _INT_TYPE_KINDS
 
     def is_output_string(self):
-        if not self.annotation:
-            return False
-        return str(self.annotation) == 'out_string: ;'
+        return self._is_output_string
 
     def is_output(self):
         if self.is_count:
             return False
         if self.is_required_count:
             return False
-        if not self.type.kind == TypeKind.POINTER:
+        return self._is_output_pointer
+
+    def _compute_is_output_pointer(self):
+        if not self._is_pointer:
             return False
-        pt = self.type.get_pointee()
+        pt = self._pointee
         if pt.is_const_qualified():
             return False
         if pt.kind == TypeKind.VOID:
@@ -467,6 +591,9 @@ class Parameter(Declaration):
     def is_struct_size(self):
         if self.is_count:
             return False
+        return self._is_struct_size
+
+    def _compute_is_struct_size(self):
         if self.type.kind not in (TypeKind.TYPEDEF, ):
             return False
         if self.name.startswith('unSizeOf'):
@@ -486,32 +613,30 @@ class Parameter(Declaration):
         return True
 
     def pre_call_block(self):
-        m = self.is_array()
-        if m:
+        if self._array_count_name is not None:
             result = ''
-            count_param = m.group(1)
-            count_param = self.get_py_name(count_param)
-            element_t = translate_type(self.type.get_pointee().spelling)
+            count_param = self.get_py_name(self._array_count_name)
+            element_t = translate_type(self._pointee.spelling)
             is_pose_array = False
-            if re.match(r'^trackedDevice.*Count$', count_param):
+            if _RE_TRACKED_DEVICE_COUNT.match(count_param):
                 is_pose_array = True
-            if re.match(r'^\S+PoseArrayCount$', count_param):
+            if _RE_POSE_ARRAY_COUNT.match(count_param):
                 is_pose_array = True
             default_length = 1
             if is_pose_array:
                 default_length = 'k_unMaxTrackedDeviceCount'
-            result += textwrap.dedent(f'''\
-                if {self.py_name} is None:
-                    {self.py_name}Arg = None
-                    {count_param} = 0
-                elif isinstance({self.py_name}, ctypes.Array):
-                    {self.py_name}Arg = byref({self.py_name}[0])
-                    {count_param} = len({self.py_name})
-                else:
-                    {self.py_name} = ({element_t} * {default_length})()
-                    {self.py_name}Arg = byref({self.py_name}[0])
-                    {count_param} = {default_length}
-                ''')
+            result += (
+                f'if {self.py_name} is None:\n'
+                f'    {self.py_name}Arg = None\n'
+                f'    {count_param} = 0\n'
+                f'elif isinstance({self.py_name}, ctypes.Array):\n'
+                f'    {self.py_name}Arg = byref({self.py_name}[0])\n'
+                f'    {count_param} = len({self.py_name})\n'
+                'else:\n'
+                f'    {self.py_name} = ({element_t} * {default_length})()\n'
+                f'    {self.py_name}Arg = byref({self.py_name}[0])\n'
+                f'    {count_param} = {default_length}\n'
+            )
             return result
         elif self.is_output_string():
             return ''
@@ -520,13 +645,13 @@ class Parameter(Declaration):
         elif self.always_value is not None:
             return f'{self.py_name} = {self.always_value}\n'
         elif not self.is_input():
-            t = translate_type(self.type.get_pointee().spelling)
+            t = translate_type(self._pointee.spelling)
             return f'{self.py_name} = {t}()\n'
         elif self.is_input_string():
-            result = textwrap.dedent(f'''\
-                if {self.py_name} is not None:
-                    {self.py_name} = bytes({self.py_name}, encoding='utf-8')
-            ''')
+            result = (
+                f'if {self.py_name} is not None:\n'
+                f"    {self.py_name} = bytes({self.py_name}, encoding='utf-8')\n"
+            )
             return result
         else:
             return ''
@@ -534,22 +659,22 @@ class Parameter(Declaration):
     def post_call_block(self):
         result = ''
         if self.is_error():
-            assert self.type.kind == TypeKind.POINTER
-            pt = self.type.get_pointee()
-            error_category = translate_error_category(pt)
+            assert self._is_pointer
+            error_category = translate_error_category(self._pointee)
             result += f'\n{error_category}.check_error_value({self.py_name}.value)'
-        if self.is_output() and self.type.kind == TypeKind.POINTER:
-            pt = self.type.get_pointee()
+        if self.is_output() and self._is_pointer:
+            pt = self._pointee
             if pt.kind == TypeKind.POINTER:
                 pt2 = pt.get_pointee()
                 if pt2.spelling.endswith('_t'):
                     n = self.py_name
-                    result += textwrap.dedent(f'''\
-                        
-                        if {n}:
-                            {n} = {n}.contents
-                        else:
-                            {n} = None''')
+                    result += (
+                        '\n'
+                        f'if {n}:\n'
+                        f'    {n} = {n}.contents\n'
+                        'else:\n'
+                        f'    {n} = None'
+                    )
         return result
 
     def input_param_name(self):
@@ -582,8 +707,8 @@ class Parameter(Declaration):
             return self.py_name
         elif self.is_output():
             return f'byref({self.py_name})'
-        elif self.type.kind == TypeKind.POINTER:
-            ptk = self.type.get_pointee().kind
+        elif self._is_pointer:
+            ptk = self._pointee.kind
             if ptk == TypeKind.CHAR_S:
                 return self.py_name
             else:
@@ -599,7 +724,7 @@ class Parameter(Declaration):
         if not self.is_output():
             return None
         result = self.py_name
-        pt0 = self.type.get_pointee()
+        pt0 = self._pointee
         extract_value = False
         if pt0.kind == TypeKind.TYPEDEF and pt0.spelling.endswith('Handle_t'):
             extract_value = True
@@ -629,35 +754,33 @@ class Struct(Declaration):
     def add_field(self, field):
         self.fields.append(field)
 
+    @cached_property
+    def translated_name(self):
+        return translate_type(self.name)
+
+    @cached_property
+    def translated_base(self):
+        if self.base is None:
+            return 'Structure'
+        return translate_type(self.base)
+
     def __str__(self):
         docstring = ''
         if self.docstring:
-            docstring = textwrap.indent(f'\n"""{self.docstring}"""\n', ' '*16)
-        fields = ''
-        for f in self.fields:
-            fields = fields + f'''
-                    {f}'''
-        name = translate_type(self.name)
-        base = 'Structure'
-        if self.base is not None:
-            base = translate_type(self.base)
+            docstring = _indent(f'\n"""{self.docstring}"""\n', 4)
+        fields = ''.join(f'\n{f.ctypes_string(indent=8)}' for f in self.fields)
+        name = self.translated_name
+        base = self.translated_base
         if name.startswith('HmdMatrix'):
             base = f'_MatrixMixin, {base}'
         if name.startswith('HmdVector'):
             base = f'_VectorMixin, {base}'
-        return inspect.cleandoc(f'''
-            class {name}({base}):{docstring}
-                _fields_ = [{fields}
-                ]
-        ''')
+        return _STRUCT_TEMPLATE.substitute(name=name, base=base, docstring=docstring, fields=fields)
 
 
 class StructureForwardDeclaration(Declaration):
     def __str__(self):
-        return inspect.cleandoc(f'''
-            class {self.name}(Structure):
-                pass
-        ''')
+        return _STRUCTURE_FORWARD_DECLARATION_TEMPLATE.substitute(name=self.name)
 
 
 class StructField(Declaration):
@@ -666,8 +789,11 @@ class StructField(Declaration):
         self.type = type_
 
     def __str__(self):
+        return self.ctypes_string()
+
+    def ctypes_string(self, indent=0):
         type_name = translate_type(self.type)
-        return f'("{self.name}", {type_name}),'
+        return f'{" "*indent}("{self.name}", {type_name}),'
 
 
 class Typedef(Declaration):
@@ -682,6 +808,14 @@ class Typedef(Declaration):
         return f'{self.name} = {orig}'
 
 
+def _indent(text, width):
+    """
+    Prefix each non-blank line with width spaces, like textwrap.indent(text, ' '*width)
+    """
+    pad = ' ' * width
+    return '\n'.join(pad + line if line and not line.isspace() else line for line in text.split('\n'))
+
+
 def translate_error_category(type_):
     error_category = type_.spelling
     assert error_category.endswith('Error')
@@ -694,61 +828,75 @@ def translate_error_category(type_):
     return f'openvr.error_code.{error_category}'
 
 
+# Memo of translate_type() results, keyed on (type_name, bracket)
+_translated_types = {}
+
+
 def translate_type(type_name, bracket=False):
     """
     Convert c++ type name to ctypes type name
     # TODO: move to ctypes generator
     """
+    key = (type_name, bracket)
+    result = _translated_types.get(key)
+    if result is None:
+        result = _translate_type_uncached(type_name, bracket)
+        _translated_types[key] = result
+    return result
+
+
+def _translate_type_uncached(type_name, bracket):
     # trim space characters
     result = type_name.strip()
-    result = re.sub(r'\bconst\s+', '', result)
-    result = re.sub(r'\s+const\b', '', result)
-    result = re.sub(r'\bstruct\s+', '', result)
-    result = re.sub(r'\benum\s+', '', result)
-    result = re.sub(r'\bunion\s+', '', result)
+    result = _RE_CONST_PREFIX.sub('', result)
+    result = _RE_CONST_SUFFIX.sub('', result)
+    result = _RE_STRUCT.sub('', result)
+    result = _RE_ENUM.sub('', result)
+    result = _RE_UNION.sub('', result)
+    # e.g. vr::HmdMatrix34_t -> HmdMatrix34_t
+    if result.startswith('vr::'):
+        result = result[4:]
     # no implicit int
     if result == 'unsigned':
         result = 'unsigned int'
     # abbreviate type for ctypes
-    result = re.sub(r'8_t\b', '8', result)
-    result = re.sub(r'16_t\b', '16', result)
-    result = re.sub(r'32_t\b', '32', result)
-    result = re.sub(r'64_t\b', '64', result)
-    result = re.sub(r'\bunsigned\s+', 'u', result)  # unsigned int -> uint
-    if re.match(r'^\s*(?:const\s+)?char\s*\*\s*$', result):
+    result = _RE_INT_SUFFIX.sub(r'\1', result)  # uint32_t -> uint32
+    result = _RE_UNSIGNED.sub('u', result)  # unsigned int -> uint
+    if _RE_CHAR_PTR.match(result):
         result = 'c_char_p'
-    result = re.sub(r'\blong\s+long\b', 'longlong', result)
+    result = _RE_LONGLONG.sub('longlong', result)
     # prepend 'c_' for ctypes
-    if re.match(r'^(float|u?int|double|u?char|u?short|u?long)', result):
+    if _RE_CTYPES_PREFIX.match(result):
         result = f'c_{result}'
     # remove leading "VR_"
-    result = re.sub(r'\bVR_', '', result)
+    if result.startswith('VR_'):
+        result = result[3:]
 
-    m = re.match(r'^([^*]+\S)\s*[*&](.*)$', result)
-    while m:  # # HmdStruct* -> POINTER(HmdStruct)
-        pointee_type = translate_type(m.group(1))
-        result = f'POINTER({pointee_type}){m.group(2)}'
-        m = re.match(r'^([^*]+\S)\s*[*&](.*)$', result)
+    while '*' in result or '&' in result:  # HmdStruct* -> POINTER(HmdStruct)
+        ix = max(result.rfind('*'), result.rfind('&'))
+        pointee = result[:ix].rstrip()
+        if not pointee:
+            break
+        pointee_type = translate_type(pointee)
+        result = f'POINTER({pointee_type}){result[ix + 1:]}'
 
     # translate pointer type "ptr"
-    m = re.match(r'^([^*]+)ptr(?:_t)?(.*)$', result)
-    while m:  # uintptr_t -> POINTER(c_uint)
-        pointee_type = translate_type(m.group(1))
-        result = f'POINTER({pointee_type}){m.group(2)}'
-        m = re.match(r'^([^*]+)ptr(?:_t)?(.*)$', result)
+    if 'ptr' in result:
+        m = _RE_PTR_T.match(result)
+        while m:  # uintptr_t -> POINTER(c_uint)
+            pointee_type = translate_type(m.group(1))
+            result = f'POINTER({pointee_type}){m.group(2)}'
+            m = _RE_PTR_T.match(result)
 
     if result == 'void':
         result = 'None'
     if result == 'POINTER(None)':
         result = 'c_void_p'
-    result = re.sub(r'\bbool\b', 'openvr_bool', result)
-
-    # e.g. vr::HmdMatrix34_t -> HmdMatrix34_t
-    if result.startswith('vr::'):
-        result = result[4:]
+    if result == 'bool':
+        result = 'openvr_bool'
 
     # e.g. float[3] -> c_float * 3
-    m = re.match(r'^([^\[]+\S)\s*\[(\d+)\](.*)$', result)
+    m = _RE_ARRAY.match(result)
     if m:
         t = f'{m.group(1)}{m.group(3)}'  # in case there are more dimensions
         t = translate_type(t, bracket=True)